@@ -1,8 +1,10 @@
 from .aiomodbus_clients import DMAioModbusSerialClient, DMAioModbusTcpClient
 from .aiomodbus_simulator_client import DMAioModbusSimulatorClient
+from .aiomodbus_device_limits import DMAioModbusDeviceLimits
 
 __all__ = [
     "DMAioModbusSerialClient",
     "DMAioModbusTcpClient",
-    "DMAioModbusSimulatorClient"
+    "DMAioModbusSimulatorClient",
+    "DMAioModbusDeviceLimits"
 ]
@@ -1,18 +1,105 @@
 from __future__ import annotations
 from typing import Callable, Coroutine, Type, Tuple, Union
+from collections import deque
+from functools import partial
 from dm_logger import DMLogger
 from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient
-from pymodbus import ModbusException, ExceptionResponse
+from pymodbus import ModbusException
 from pymodbus.pdu import ModbusExceptions
+from .aiomodbus_batch_read_planner import DMAioModbusBatchReadPlanner
+from .aiomodbus_device_limits import DMAioModbusDeviceLimits
+from .aiomodbus_register_shadow import DMAioModbusRegisterShadow
 import asyncio
+import copy
+import random
+import time
 
 __all__ = ['DMAioModbusBaseClient']
 
 
+class _DMAioModbusRequest:
+    __slots__ = ("method", "kwargs", "key", "set_result", "__callback")
+
+    def __init__(
+        self,
+        callback: Callable[[], Coroutine[None, None, Tuple[Union[list, bool], str]]],
+        set_result: Callable,
+        method: Callable,
+        kwargs: dict
+    ) -> None:
+        self.__callback = callback
+        self.set_result = set_result
+        self.method = method
+        self.kwargs = kwargs
+        self.key = (method.__name__, kwargs["slave"])
+
+    async def __call__(self) -> None:
+        self.set_result(await self.__callback())
+
+
 class DMAioModbusBaseClient:
     _CALLBACK_TYPE = Callable[[], Coroutine]
     _RETURN_CALLBACK_TYPE = Callable[[], Coroutine[None, None, Tuple[Union[list, bool], str]]]
-    _logger = None
+    _COALESCED_READS = ("read_holding_registers", "read_input_registers")
+    _BIT_READS = ("read_coils", "read_discrete_inputs")
+    _MAX_READ_WRITE_REGISTERS = 121
+    _FUSED_WRITES = ("write_register", "write_registers")
+    _WRITE_TABLES = {
+        "write_coil": "coils",
+        "write_coils": "coils",
+        "write_register": "registers",
+        "write_registers": "registers"
+    }
+    _CACHED_READS = {
+        "read_holding_registers": "registers",
+        "read_input_registers": None
+    }
+    _CLIENT_METHODS = (
+        "read_coils",
+        "read_discrete_inputs",
+        "read_holding_registers",
+        "read_input_registers",
+        "write_coil",
+        "write_register",
+        "write_coils",
+        "write_registers",
+        "readwrite_registers"
+    )
+    _BACKOFF_JITTERS = ("full", "equal")
+    _BACKOFF_MAX_EXPONENT = 32
+    _backoff_base_s = 0.5
+    _backoff_max_s = 300
+    _backoff_jitter = "full"
+    _custom_logger = None
+    __slots__ = (
+        "__weakref__",
+        "__logger",
+        "__client",
+        "__methods",
+        "__pool",
+        "__actions",
+        "__worker",
+        "__wakeup",
+        "__shadow",
+        "__shadow_window",
+        "__cache",
+        "__cache_writes",
+        "__next_cache_prune",
+        "__pending",
+        "__connect_attempt",
+        "__next_connect_time",
+        "__differential_writes",
+        "__fuse_write_read",
+        "__read_planner",
+        "__limits",
+        "__read_ttl_s",
+        "__slave_id",
+        "__execute_timeout_s",
+        "__disconnect_time_s",
+        "__after_execute_timeout_ms",
+        "__next_request_time",
+        "_return_errors"
+    )
 
     def __init__(
         self,
@@ -22,129 +109,296 @@ class DMAioModbusBaseClient:
         execute_timeout_s: int = 5,
         disconnect_timeout_s: int = 20,
         after_execute_timeout_ms: int = 3,
+        read_coalesce_gap: int = None,
+        differential_writes: bool = False,
+        fuse_write_read: bool = False,
+        pool_size: int = 1,
+        read_ttl_ms: int = 0,
+        device_limits: DMAioModbusDeviceLimits = None,
+        slave_id: int = 1,
+        shadow_base: int = 0,
+        shadow_size: int = 0,
         name_tag: str = None
     ) -> None:
-        if self._logger is None:
+        if self._custom_logger is None:
             name_suffix = f"-{name_tag}" if name_tag is not None else ""
-            self._logger = DMLogger(f"{self.__class__.__name__}{name_suffix}")
-        self._logger.debug(**modbus_config)
+            self.__logger = DMLogger(f"{self.__class__.__name__}{name_suffix}")
+        else:
+            self.__logger = self._custom_logger
+        self.__logger.debug(**modbus_config)
 
-        self.__actions = []
-        self.__is_locked = False
-        self.__current_group = False
-        self.__disconnect_task = None
+        self.__shadow = {}
+        self.__cache = {}
+        # [count of writes issued]: a list so pool connections share it with the cache
+        self.__cache_writes = [0]
         self._return_errors = bool(return_errors)
+        self.__differential_writes = bool(differential_writes)
+        self.__fuse_write_read = bool(fuse_write_read)
         self.__execute_timeout_s, self.__disconnect_time_s, self.__after_execute_timeout_ms = self.__validate_timeouts(
             execute_timeout_s, disconnect_timeout_s, after_execute_timeout_ms
         )
-        self.__client = aio_modbus_lib_class(**modbus_config, timeout=1, retry=1)
-
-    async def read_coils(self, address: int, count: int = 1, slave: int = 1) -> list | (list, str):
-        return await self._read(self.__client.read_coils, {
+        if read_coalesce_gap is not None and (not isinstance(read_coalesce_gap, int) or read_coalesce_gap < 0):
+            self.__logger.warning("Invalid read_coalesce_gap value. Expected: value >= 0. "
+                                  "Is set to default value: None (disabled)")
+            read_coalesce_gap = None
+        if not isinstance(device_limits, DMAioModbusDeviceLimits) or not device_limits.is_valid():
+            if device_limits is not None:
+                self.__logger.warning("Invalid device_limits value. Expected: 0 < max_read_registers <= 125, "
+                                      "0 < max_read_bits <= 2000. Is set to default value: DMAioModbusDeviceLimits()")
+            device_limits = DMAioModbusDeviceLimits()
+        self.__limits = device_limits
+        if not isinstance(slave_id, int) or not 0 <= slave_id <= 247:
+            if slave_id is not None:
+                self.__logger.warning("Invalid slave_id value. Expected: 0 <= value <= 247. "
+                                      "Is set to default value: 1")
+            slave_id = 1
+        self.__slave_id = slave_id
+        if not isinstance(shadow_base, int) or not 0 <= shadow_base <= 0xFFFF:
+            if shadow_base is not None:
+                self.__logger.warning("Invalid shadow_base value. Expected: 0 <= value <= 65535. "
+                                      "Is set to default value: 0")
+            shadow_base = 0
+        if not isinstance(shadow_size, int) or not 0 <= shadow_size <= 0x10000 - shadow_base:
+            if shadow_size is not None:
+                self.__logger.warning("Invalid shadow_size value. Expected: 0 <= shadow_base + value <= 65536. "
+                                      "Is set to default value: 0")
+            shadow_size = 0
+        self.__shadow_window = (shadow_base, shadow_size)
+        self.__read_planner = None
+        if read_coalesce_gap is not None:
+            self.__read_planner = DMAioModbusBatchReadPlanner(read_coalesce_gap, device_limits.max_read_registers)
+        if not isinstance(read_ttl_ms, int) or read_ttl_ms < 0:
+            if read_ttl_ms is not None:
+                self.__logger.warning("Invalid read_ttl_ms value. Expected: value >= 0. "
+                                      "Is set to default value: 0")
+            read_ttl_ms = 0
+        self.__read_ttl_s = read_ttl_ms / 1000
+        self.__init_connection(aio_modbus_lib_class, modbus_config)
+
+        if not isinstance(pool_size, int) or pool_size < 1:
+            if pool_size is not None:
+                self.__logger.warning("Invalid pool_size value. Expected: value >= 1. "
+                                      "Is set to default value: 1")
+            pool_size = 1
+        for _ in range(pool_size - 1):
+            self.__pool.append(self.__create_pool_connection(aio_modbus_lib_class, modbus_config))
+
+    def __init_connection(
+        self,
+        aio_modbus_lib_class: Type[AsyncModbusSerialClient | AsyncModbusTcpClient],
+        modbus_config: dict[str, str | int]
+    ) -> None:
+        self.__actions = deque()
+        self.__worker = None
+        self.__wakeup = None
+        self.__pending = 0
+        self.__connect_attempt = 0
+        self.__next_connect_time = 0
+        self.__next_request_time = 0
+        self.__next_cache_prune = 0
+        # pymodbus reconnects on its own after connection_lost, bypassing _connect(), so the shadow
+        # must also be dropped from its reconnect callback (a power-cycled device lost its registers)
+        self.__client = aio_modbus_lib_class(**modbus_config, timeout=1, retry=1,
+                                             on_reconnect_callback=self.__shadow.clear)
+        self.__methods = {name: getattr(self.__client, name) for name in self._CLIENT_METHODS}
+        self.__pool = [self]
+
+    def __create_pool_connection(
+        self,
+        aio_modbus_lib_class: Type[AsyncModbusSerialClient | AsyncModbusTcpClient],
+        modbus_config: dict[str, str | int]
+    ) -> DMAioModbusBaseClient:
+        # shallow copy: same class and settings, shared logger/shadow/cache; per-connection state is reset below
+        connection = copy.copy(self)
+        connection.__init_connection(aio_modbus_lib_class, modbus_config)
+        return connection
+
+    async def read_coils(self, address: int, count: int = 1, slave: int = None) -> list | (list, str):
+        return await self._read(self.__methods["read_coils"], {
             "address": address,
             "count": count,
-            "slave": slave
+            "slave": self.__slave_id if slave is None else slave
         })
 
-    async def read_discrete_inputs(self, address: int, count: int = 1, slave: int = 1) -> list | (list, str):
-        return await self._read(self.__client.read_discrete_inputs, {
+    async def read_discrete_inputs(self, address: int, count: int = 1, slave: int = None) -> list | (list, str):
+        return await self._read(self.__methods["read_discrete_inputs"], {
             "address": address,
             "count": count,
-            "slave": slave
+            "slave": self.__slave_id if slave is None else slave
         })
 
-    async def read_holding_registers(self, address: int, count: int = 1, slave: int = 1) -> list | (list, str):
-        return await self._read(self.__client.read_holding_registers, {
+    async def read_holding_registers(self, address: int, count: int = 1, slave: int = None) -> list | (list, str):
+        return await self._read(self.__methods["read_holding_registers"], {
             "address": address,
             "count": count,
-            "slave": slave
+            "slave": self.__slave_id if slave is None else slave
         })
 
-    async def read_input_registers(self, address: int, count: int = 1, slave: int = 1) -> list | (list, str):
-        return await self._read(self.__client.read_input_registers, {
+    async def read_input_registers(self, address: int, count: int = 1, slave: int = None) -> list | (list, str):
+        return await self._read(self.__methods["read_input_registers"], {
             "address": address,
             "count": count,
-            "slave": slave
+            "slave": self.__slave_id if slave is None else slave
         })
 
-    async def write_coil(self, address: int, value: int, slave: int = 1) -> bool | (bool, str):
-        return await self._write(self.__client.write_coil, {
+    async def write_coil(self, address: int, value: int, slave: int = None) -> bool | (bool, str):
+        return await self._write(self.__methods["write_coil"], {
             "address": address,
             "value": value,
-            "slave": slave
+            "slave": self.__slave_id if slave is None else slave
         })
 
-    async def write_register(self, address: int, value: int, slave: int = 1) -> bool | (bool, str):
-        return await self._write(self.__client.write_register, {
+    async def write_register(self, address: int, value: int, slave: int = None) -> bool | (bool, str):
+        return await self._write(self.__methods["write_register"], {
             "address": address,
             "value": value,
-            "slave": slave
+            "slave": self.__slave_id if slave is None else slave
         })
 
-    async def write_coils(self, address: int, values: list[int] | int, slave: int = 1) -> bool | (bool, str):
-        return await self._write(self.__client.write_coils, {
+    async def write_coils(self, address: int, values: list[int] | int, slave: int = None) -> bool | (bool, str):
+        return await self._write(self.__methods["write_coils"], {
             "address": address,
             "values": values,
-            "slave": slave
+            "slave": self.__slave_id if slave is None else slave
         })
 
-    async def write_registers(self, address: int, values: list[int] | int, slave: int = 1) -> bool | (bool, str):
-        return await self._write(self.__client.write_registers, {
+    async def write_registers(self, address: int, values: list[int] | int, slave: int = None) -> bool | (bool, str):
+        return await self._write(self.__methods["write_registers"], {
             "address": address,
             "values": values,
-            "slave": slave
+            "slave": self.__slave_id if slave is None else slave
         })
 
     async def _read(self, method: Callable, kwargs: dict) -> list | (list, str):
-        async def read_cb() -> (list, str):
-            result, error = await self.__error_handler(method, kwargs)
-            if hasattr(result, "registers"):
-                return result.registers, error
-            return [], error
+        registers = self.__get_cached(method, kwargs)
+        if registers is not None:
+            return (registers, "") if self._return_errors else registers
 
-        return await self._execute_and_return(read_cb, [])
+        connection = self.__pick_connection()
+        if connection is not self:
+            return await connection._read(connection.__methods[method.__name__], kwargs)
 
-    async def _write(self, method: Callable, kwargs: dict) -> bool | (bool, str):
-        async def write_cb() -> (bool, str):
-            _, error = await self.__error_handler(method, kwargs)
-            result = not error
-            return result, error
+        return await self._execute_and_return(partial(self.__read_chunked, method, kwargs), [], method, kwargs)
 
-        return await self._execute_and_return(write_cb, False)
+    async def _write(self, method: Callable, kwargs: dict) -> bool | (bool, str):
+        self.__invalidate_cached(method, kwargs)
+        connection = self.__pick_connection()
+        if connection is not self:
+            return await connection._write(connection.__methods[method.__name__], kwargs)
+
+        if (self.__differential_writes and method.__name__ in self._WRITE_TABLES
+                and isinstance(kwargs["address"], int)):
+            write_cb = partial(self.__write_changed, method, kwargs)
+        else:
+            write_cb = partial(self.__write_all, method, kwargs)
+        return await self._execute_and_return(write_cb, False, method, kwargs)
 
     async def _execute_and_return(
         self,
         callback: _RETURN_CALLBACK_TYPE,
-        empty_result: list | bool
+        empty_result: list | bool,
+        method: Callable = None,
+        kwargs: dict = None
     ) -> (list | bool, str):
-        result_obj = {"result": (empty_result, ""), "executed": False}
+        future = asyncio.get_running_loop().create_future()
+        writes_before = self.__cache_writes[0]
+
+        def set_result(result: (list | bool, str)) -> None:
+            if method is not None:
+                self.__update_cache(method, kwargs, result, writes_before)
+            if not future.done():
+                future.set_result(result)
 
-        async def return_from_callback() -> None:
-            result_obj["result"] = await callback()
-            result_obj["executed"] = True
+        if method is None:
+            async def return_from_callback() -> None:
+                set_result(await callback())
 
-        self.__execute(return_from_callback)
+            self.__execute(return_from_callback)
+        else:
+            self.__execute(_DMAioModbusRequest(callback, set_result, method, kwargs))
 
-        wait_time = 1.5
-        while not result_obj["executed"] and wait_time < self.__execute_timeout_s:
-            await asyncio.sleep(0.01)
-            wait_time += 0.01
+        self.__pending += 1
+        try:
+            result = await asyncio.wait_for(future, self.__execute_timeout_s)
+        except asyncio.TimeoutError:
+            result = (empty_result, "")
+        finally:
+            self.__pending -= 1
 
         if self._return_errors:
-            return result_obj["result"]
-        return result_obj["result"][0]
+            return result
+        return result[0]
+
+    def __get_cached(self, method: Callable, kwargs: dict) -> list | None:
+        if not self.__read_ttl_s or not self.__is_cache_key(kwargs):
+            return None
+        key = (method.__name__, kwargs["slave"], kwargs["address"], kwargs["count"])
+        expiry, registers = self.__cache.get(key, (0, None))
+        if time.monotonic() >= expiry:
+            self.__cache.pop(key, None)
+            return None
+        return list(registers)
+
+    def __update_cache(
+        self,
+        method: Callable,
+        kwargs: dict,
+        result: (list | bool, str),
+        writes_before: int
+    ) -> None:
+        if not self.__read_ttl_s:
+            return
+        if method.__name__ in self._WRITE_TABLES:
+            self.__invalidate_cached(method, kwargs)
+            return
+        data, error = result
+        # a write issued while this read was in flight (e.g. on another pool connection) may have
+        # already run its invalidation, so the read result could predate it: do not store it
+        if (method.__name__ in self._CACHED_READS and not error and self.__cache_writes[0] == writes_before
+                and self.__is_cache_key(kwargs)):
+            now = time.monotonic()
+            if now >= self.__next_cache_prune:
+                self.__next_cache_prune = now + self.__read_ttl_s
+                for key in [key for key, (expiry, _) in self.__cache.items() if now >= expiry]:
+                    del self.__cache[key]
+            key = (method.__name__, kwargs["slave"], kwargs["address"], kwargs["count"])
+            self.__cache[key] = (now + self.__read_ttl_s, list(data))
+
+    def __invalidate_cached(self, method: Callable, kwargs: dict) -> None:
+        if not self.__read_ttl_s:
+            return
+        self.__cache_writes[0] += 1
+        if not self.__cache or not isinstance(kwargs["address"], int):
+            return
+        table = self._WRITE_TABLES.get(method.__name__)
+        address = kwargs["address"]
+        end = address + len(self.__write_values(kwargs))
+        now = time.monotonic()
+        for key, (expiry, _) in list(self.__cache.items()):
+            name, slave, read_address, count = key
+            if now >= expiry or (self._CACHED_READS[name] == table and slave == kwargs["slave"]
+                                 and read_address < end and address < read_address + count):
+                del self.__cache[key]
+
+    def __pick_connection(self) -> DMAioModbusBaseClient:
+        if len(self.__pool) == 1:
+            return self
+        return min(self.__pool, key=lambda connection: connection.__pending)
 
     async def __error_handler(self, method: Callable, kwargs: dict) -> (list | None, str):
         result = None
         error = ""
         try:
+            delay = self.__next_request_time - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
             result = await method(**kwargs)
-            await asyncio.sleep(self.__after_execute_timeout_ms)
-            if result.isError() or isinstance(result, ExceptionResponse):
+            self.__next_request_time = time.monotonic() + self.__after_execute_timeout_ms
+            if result.isError():
                 error = f"{result.exception_code}_{ModbusExceptions.decode(result.exception_code)}"
                 raise ModbusException(result)
         except Exception as e:
-            self._logger.error(f"Error: {e}", method=method.__name__, params=kwargs)
+            self.__logger.error(f"Error: {e}", method=method.__name__, params=kwargs)
             if not error:
                 error = str(e)
             if not self._is_connected:
@@ -152,68 +406,257 @@ class DMAioModbusBaseClient:
         return result, error
 
     def __execute(self, callback: _CALLBACK_TYPE) -> None:
-        async def execute_cb() -> None:
-            self.__actions.append(callback)
-            if self.__is_locked:
-                return
-
-            self.__is_locked = True
-            if self.__disconnect_task is not None:
-                self.__disconnect_task.cancel()
-
+        self.__actions.append(callback)
+        if self.__worker is None or self.__worker.done():
+            self.__wakeup = asyncio.Event()
+            self.__worker = asyncio.create_task(self.__run_worker())
+        self.__wakeup.set()
+
+    async def __run_worker(self) -> None:
+        while True:
+            await self.__wakeup.wait()
             if not self._is_connected:
                 await self._connect()
+            await self.__execute_actions()
+
+            self.__wakeup.clear()
+            try:
+                await asyncio.wait_for(self.__wakeup.wait(), self.__disconnect_time_s)
+            except asyncio.TimeoutError:
+                if self.__actions:
+                    continue
+                if self._is_connected:
+                    self._disconnect()
+                return
 
-            temp_cb = None
-            while self.__actions or callable(temp_cb):
-                if callable(temp_cb):
-                    cb = temp_cb
-                else:
-                    cb = self.__actions.pop(0)
-                    if not callable(cb):
-                        cb_type = None if cb is None else type(cb)
-                        self._logger.error(f"Invalid callback: Expected callable, got {cb_type}")
-                        continue
+    async def __execute_actions(self) -> None:
+        temp_cb = None
+        while self.__actions or callable(temp_cb):
+            if callable(temp_cb):
+                cb = temp_cb
+            else:
+                cb = self.__actions.popleft()
+                if not callable(cb):
+                    cb_type = None if cb is None else type(cb)
+                    self.__logger.error(f"Invalid callback: Expected callable, got {cb_type}")
+                    continue
                 try:
-                    await cb()
+                    cb = self.__merge_queued(cb)
                 except Exception as e:
-                    if not self._is_connected:
-                        self._logger.error(f"Connection error: {e}.\nReconnecting...")
-                        await self._connect()
-                    else:
-                        self._logger.error(e)
-                    if callable(temp_cb):
-                        temp_cb = None
-                    else:
-                        temp_cb = cb
+                    self.__logger.error(f"Merge error: {e}. Executing request separately")
+            try:
+                await cb()
+            except Exception as e:
+                if not self._is_connected:
+                    self.__logger.error(f"Connection error: {e}.\nReconnecting...")
+                    await self._connect()
                 else:
+                    self.__logger.error(e)
+                if callable(temp_cb):
                     temp_cb = None
+                else:
+                    temp_cb = cb
+            else:
+                temp_cb = None
+
+    def __merge_queued(self, cb: _CALLBACK_TYPE) -> _CALLBACK_TYPE:
+        if not isinstance(cb, _DMAioModbusRequest):
+            return cb
+        if cb.method.__name__ in self._FUSED_WRITES:
+            return self.__fuse_queued(cb)
+        if (self.__read_planner is None or cb.method.__name__ not in self._COALESCED_READS
+                or not self.__is_range(cb.kwargs)):
+            return cb
+
+        batch = [cb]
+        while (self.__actions and isinstance(self.__actions[0], _DMAioModbusRequest)
+               and self.__actions[0].key == cb.key and self.__is_range(self.__actions[0].kwargs)):
+            batch.append(self.__actions.popleft())
+        if len(batch) == 1:
+            return cb
+
+        async def batch_cb() -> None:
+            await self.__read_batch(batch)
+
+        return batch_cb
+
+    def __fuse_queued(self, write: _DMAioModbusRequest) -> _CALLBACK_TYPE:
+        if not self.__fuse_write_read or not self.__actions:
+            return write
+        read = self.__actions[0]
+        max_read_count = min(DMAioModbusDeviceLimits.MAX_READ_REGISTERS, self.__limits.max_read_registers)
+        if (not isinstance(read, _DMAioModbusRequest) or read.key != ("read_holding_registers", write.kwargs["slave"])
+                or not self.__is_range(read.kwargs) or read.kwargs["count"] > max_read_count
+                or not isinstance(write.kwargs["address"], int)
+                or len(self.__write_values(write.kwargs)) > self._MAX_READ_WRITE_REGISTERS):
+            return write
+        self.__actions.popleft()
+
+        async def fused_cb() -> None:
+            await self.__write_and_read(write, read)
+
+        return fused_cb
+
+    async def __write_and_read(self, write: _DMAioModbusRequest, read: _DMAioModbusRequest) -> None:
+        values = self.__write_values(write.kwargs)
+        slave = write.kwargs["slave"]
+        result, error = await self.__error_handler(self.__methods["readwrite_registers"], {
+            "read_address": read.kwargs["address"],
+            "read_count": read.kwargs["count"],
+            "write_address": write.kwargs["address"],
+            "values": values,
+            "slave": slave
+        })
+        if error and self._is_connected:
+            # the fused request fails as a whole: send both separately so each caller gets its own result
+            if self.__differential_writes:
+                write_cb = partial(self.__write_changed, write.method, write.kwargs)
+            else:
+                write_cb = partial(self.__write_all, write.method, write.kwargs)
+            await self.__resolve_separately(write, write_cb, False)
+            await self.__resolve_separately(read, partial(self.__read_chunked, read.method, read.kwargs), [])
+            return
+        if self.__differential_writes:
+            shadow = self.__get_shadow("registers", slave)
+            if error:
+                shadow.drop(write.kwargs["address"], len(values))
+            else:
+                shadow.update(write.kwargs["address"], values)
+        registers = result.registers if hasattr(result, "registers") else []
+        self.__sync_shadow(read.method, slave, read.kwargs["address"], registers)
+        write.set_result((not error, error))
+        read.set_result((registers, error))
+
+    async def __resolve_separately(
+        self,
+        request: _DMAioModbusRequest,
+        callback: _RETURN_CALLBACK_TYPE,
+        empty_result: list | bool
+    ) -> None:
+        try:
+            result = await callback()
+        except Exception as e:
+            self.__logger.error(f"Error: {e}", method=request.method.__name__, params=request.kwargs)
+            result = (empty_result, str(e))
+        request.set_result(result)
+
+    async def __read_batch(self, batch: list[_DMAioModbusRequest]) -> None:
+        method = batch[0].method
+        slave = batch[0].kwargs["slave"]
+        ranges = [(request.kwargs["address"], request.kwargs["count"]) for request in batch]
+        for address, count, members in self.__read_planner.plan(ranges):
+            registers, error = await self.__read_chunked(method, {"address": address, "count": count, "slave": slave})
+            if error and len(members) > 1 and self._is_connected:
+                for index, _ in members:
+                    batch[index].set_result(await self.__read_chunked(method, batch[index].kwargs))
+                continue
+            for index, offset in members:
+                batch[index].set_result((registers[offset:offset + ranges[index][1]], error))
+
+    async def __read_chunked(self, method: Callable, kwargs: dict) -> (list, str):
+        if method.__name__ in self._BIT_READS:
+            limit = self.__limits.max_read_bits
+        else:
+            limit = self.__limits.max_read_registers
+        address, count, slave = kwargs["address"], kwargs["count"], kwargs["slave"]
 
-            self.__is_locked = False
-            self.__disconnect_task = asyncio.create_task(self.__wait_on_disconnect())
+        if not self.__is_range(kwargs) or count <= limit:
+            result, error = await self.__error_handler(method, kwargs)
+            registers = result.registers if hasattr(result, "registers") else []
+        else:
+            registers, error = [], ""
+            for offset in range(0, count, limit):
+                chunk_kwargs = {"address": address + offset, "count": min(limit, count - offset), "slave": slave}
+                result, error = await self.__error_handler(method, chunk_kwargs)
+                if error:
+                    registers = []
+                    break
+                registers.extend(result.registers if hasattr(result, "registers") else [])
+        if registers:
+            self.__sync_shadow(method, slave, address, registers)
+        return registers, error
+
+    async def __write_all(self, method: Callable, kwargs: dict) -> (bool, str):
+        _, error = await self.__error_handler(method, kwargs)
+        return not error, error
+
+    async def __write_changed(self, method: Callable, kwargs: dict) -> (bool, str):
+        table = self._WRITE_TABLES[method.__name__]
+        if table == "coils":
+            single_method, multiple_method = self.__methods["write_coil"], self.__methods["write_coils"]
+        else:
+            single_method, multiple_method = self.__methods["write_register"], self.__methods["write_registers"]
+        values = self.__write_values(kwargs)
+        if table == "coils":
+            values = [bool(value) for value in values]
+        slave = kwargs["slave"]
+        shadow = self.__get_shadow(table, slave)
+
+        for address, run in shadow.changed_runs(kwargs["address"], values):
+            if len(run) == 1:
+                run_method, run_kwargs = single_method, {"address": address, "value": run[0], "slave": slave}
+            else:
+                run_method, run_kwargs = multiple_method, {"address": address, "values": run, "slave": slave}
+            _, error = await self.__error_handler(run_method, run_kwargs)
+            if error:
+                shadow.drop(address, len(run))
+                return False, error
+            shadow.update(address, run)
+        return True, ""
+
+    @staticmethod
+    def __is_range(kwargs: dict) -> bool:
+        return isinstance(kwargs.get("address"), int) and isinstance(kwargs.get("count"), int)
+
+    @classmethod
+    def __is_cache_key(cls, kwargs: dict) -> bool:
+        return cls.__is_range(kwargs) and isinstance(kwargs.get("slave"), int)
 
-        _ = asyncio.create_task(execute_cb())
+    @staticmethod
+    def __write_values(kwargs: dict) -> list:
+        values = kwargs["value"] if "value" in kwargs else kwargs["values"]
+        return list(values) if isinstance(values, (list, tuple)) else [values]
+
+    def __get_shadow(self, table: str, slave: int) -> DMAioModbusRegisterShadow:
+        shadow = self.__shadow.get((table, slave))
+        if shadow is None:
+            shadow = self.__shadow[(table, slave)] = DMAioModbusRegisterShadow(*self.__shadow_window)
+        return shadow
+
+    def __sync_shadow(self, method: Callable, slave: int, address: int, registers: list) -> None:
+        if self.__differential_writes and method.__name__ == "read_holding_registers":
+            self.__get_shadow("registers", slave).update(address, registers)
 
     @property
     def _is_connected(self) -> bool:
         return self.__client.connected
 
     async def _connect(self) -> None:
+        if time.monotonic() < self.__next_connect_time:
+            return
+        self.__shadow.clear()
         try:
             if not await self.__client.connect():
                 raise ConnectionError("No connection established")
         except Exception as e:
-            self._logger.error(f"Connection error: {e}")
+            delay = self.__backoff_delay()
+            self.__connect_attempt = min(self.__connect_attempt + 1, self._BACKOFF_MAX_EXPONENT)
+            self.__next_connect_time = time.monotonic() + delay
+            self.__logger.error(f"Connection error: {e}. Next attempt in {delay:.2f}s")
+        else:
+            self.__connect_attempt = 0
+            self.__next_connect_time = 0
+
+    def __backoff_delay(self) -> float:
+        delay = min(self._backoff_max_s, self._backoff_base_s * (2 ** self.__connect_attempt))
+        if self._backoff_jitter == "equal":
+            return delay / 2 + random.uniform(0, delay / 2)
+        return random.uniform(0, delay)
 
     def _disconnect(self) -> None:
+        self.__shadow.clear()
         self.__client.close()
 
-    async def __wait_on_disconnect(self) -> None:
-        await asyncio.sleep(self.__disconnect_time_s)
-
-        if self._is_connected:
-            self._disconnect()
-
     def __validate_timeouts(
         self,
         execute_timeout_s: int,
@@ -222,21 +665,37 @@ class DMAioModbusBaseClient:
     ) -> (int, int):
         if not isinstance(execute_timeout_s, int) or execute_timeout_s < 0:
             if execute_timeout_s is not None:
-                self._logger.warning("Invalid execute_timeout_s value. Expected: value > 0. "
-                                     "Is set to default value: 5")
+                self.__logger.warning("Invalid execute_timeout_s value. Expected: value > 0. "
+                                      "Is set to default value: 5")
             execute_timeout_s = 5
         if not isinstance(disconnect_timeout_s, int) or disconnect_timeout_s < 0:
             if disconnect_timeout_s is not None:
-                self._logger.warning("Invalid disconnect_timeout_s value. Expected: value > 0. "
-                                     "Is set to default value: 20")
+                self.__logger.warning("Invalid disconnect_timeout_s value. Expected: value > 0. "
+                                      "Is set to default value: 20")
             disconnect_timeout_s = 20
         if not isinstance(after_execute_timeout_ms, int) or after_execute_timeout_ms < 0:
             if after_execute_timeout_ms is not None:
-                self._logger.warning("Invalid after_execute_timeout_ms value. Expected: value > 0. "
-                                     "Is set to default value: 3")
+                self.__logger.warning("Invalid after_execute_timeout_ms value. Expected: value > 0. "
+                                      "Is set to default value: 3")
             after_execute_timeout_ms = 3
         return execute_timeout_s, disconnect_timeout_s, after_execute_timeout_ms / 1000
 
+    @classmethod
+    def set_backoff(cls, base_s: float = 0.5, max_s: float = 300, jitter: str = "full") -> None:
+        if (isinstance(base_s, (int, float)) and base_s >= 0 and
+            isinstance(max_s, (int, float)) and max_s >= base_s and
+            jitter in cls._BACKOFF_JITTERS
+        ):
+            cls._backoff_base_s = base_s
+            cls._backoff_max_s = max_s
+            cls._backoff_jitter = jitter
+        else:
+            print("Invalid backoff")
+
+    @property
+    def _logger(self):
+        return self.__logger
+
     @classmethod
     def set_logger(cls, logger) -> None:
         if (hasattr(logger, "debug") and isinstance(logger.debug, Callable) and
@@ -244,6 +703,6 @@ class DMAioModbusBaseClient:
             hasattr(logger, "warning") and isinstance(logger.warning, Callable) and
             hasattr(logger, "error") and isinstance(logger.error, Callable)
         ):
-            cls._logger = logger
+            cls._custom_logger = logger
         else:
             print("Invalid logger")
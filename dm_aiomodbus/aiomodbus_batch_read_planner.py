@@ -0,0 +1,30 @@
+from __future__ import annotations
+from typing import List, Tuple
+
+__all__ = ['DMAioModbusBatchReadPlanner']
+
+
+class DMAioModbusBatchReadPlanner:
+    """Groups (address, count) read ranges into as few wire requests as possible"""
+    _MEMBER_TYPE = Tuple[int, int]
+    _GROUP_TYPE = Tuple[int, int, List[_MEMBER_TYPE]]
+    __slots__ = ("__max_gap", "__max_count")
+
+    def __init__(self, max_gap: int = 0, max_count: int = 125) -> None:
+        self.__max_gap = max_gap
+        self.__max_count = max_count
+
+    def plan(self, ranges: List[Tuple[int, int]]) -> List[_GROUP_TYPE]:
+        """Returns [(start, count, [(range_index, offset), ...]), ...]"""
+        groups = []
+        for index in sorted(range(len(ranges)), key=lambda i: ranges[i][0]):
+            address, count = ranges[index]
+            if groups:
+                start, span, members = groups[-1]
+                end = max(start + span, address + count)
+                if address - (start + span) <= self.__max_gap and end - start <= self.__max_count:
+                    members.append((index, address - start))
+                    groups[-1] = (start, end - start, members)
+                    continue
+            groups.append((address, count, [(index, 0)]))
+        return groups
@@ -1,11 +1,14 @@
 from __future__ import annotations
 from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient
 from .aiomodbus_base_client import DMAioModbusBaseClient
+from .aiomodbus_device_limits import DMAioModbusDeviceLimits
 
 __all__ = ["DMAioModbusSerialClient", "DMAioModbusTcpClient"]
 
 
 class DMAioModbusSerialClient(DMAioModbusBaseClient):
+    __slots__ = ()
+
     def __init__(
         self,
         port: str,
@@ -17,6 +20,14 @@ class DMAioModbusSerialClient(DMAioModbusBaseClient):
         execute_timeout_s: int = None,
         disconnect_timeout_s: int = None,
         after_execute_timeout_ms: int = None,
+        read_coalesce_gap: int = None,
+        differential_writes: bool = None,
+        fuse_write_read: bool = None,
+        read_ttl_ms: int = None,
+        device_limits: DMAioModbusDeviceLimits = None,
+        slave_id: int = None,
+        shadow_base: int = None,
+        shadow_size: int = None,
         name_tag: str = None,
     ) -> None:
         modbus_config = {
@@ -34,11 +45,21 @@ class DMAioModbusSerialClient(DMAioModbusBaseClient):
             execute_timeout_s=execute_timeout_s,
             disconnect_timeout_s=disconnect_timeout_s,
             after_execute_timeout_ms=after_execute_timeout_ms,
+            read_coalesce_gap=read_coalesce_gap,
+            differential_writes=differential_writes,
+            fuse_write_read=fuse_write_read,
+            read_ttl_ms=read_ttl_ms,
+            device_limits=device_limits,
+            slave_id=slave_id,
+            shadow_base=shadow_base,
+            shadow_size=shadow_size,
             name_tag=name_tag
         )
 
 
 class DMAioModbusTcpClient(DMAioModbusBaseClient):
+    __slots__ = ()
+
     def __init__(
         self,
         host: str,
@@ -47,6 +68,15 @@ class DMAioModbusTcpClient(DMAioModbusBaseClient):
         execute_timeout_s: int = None,
         disconnect_timeout_s: int = None,
         after_execute_timeout_ms: int = None,
+        read_coalesce_gap: int = None,
+        differential_writes: bool = None,
+        fuse_write_read: bool = None,
+        pool_size: int = None,
+        read_ttl_ms: int = None,
+        device_limits: DMAioModbusDeviceLimits = None,
+        slave_id: int = None,
+        shadow_base: int = None,
+        shadow_size: int = None,
         name_tag: str = None
     ) -> None:
         modbus_config = {
@@ -61,5 +91,14 @@ class DMAioModbusTcpClient(DMAioModbusBaseClient):
             execute_timeout_s=execute_timeout_s,
             disconnect_timeout_s=disconnect_timeout_s,
             after_execute_timeout_ms=after_execute_timeout_ms,
+            read_coalesce_gap=read_coalesce_gap,
+            differential_writes=differential_writes,
+            fuse_write_read=fuse_write_read,
+            pool_size=pool_size,
+            read_ttl_ms=read_ttl_ms,
+            device_limits=device_limits,
+            slave_id=slave_id,
+            shadow_base=shadow_base,
+            shadow_size=shadow_size,
             name_tag=name_tag
         )
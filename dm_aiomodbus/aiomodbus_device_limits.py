@@ -0,0 +1,17 @@
+from __future__ import annotations
+from dataclasses import dataclass
+
+__all__ = ['DMAioModbusDeviceLimits']
+
+
+@dataclass(frozen=True)
+class DMAioModbusDeviceLimits:
+    MAX_READ_REGISTERS = 125
+    MAX_READ_BITS = 2000
+
+    max_read_registers: int = MAX_READ_REGISTERS
+    max_read_bits: int = MAX_READ_BITS
+
+    def is_valid(self) -> bool:
+        return (isinstance(self.max_read_registers, int) and 0 < self.max_read_registers <= self.MAX_READ_REGISTERS
+                and isinstance(self.max_read_bits, int) and 0 < self.max_read_bits <= self.MAX_READ_BITS)
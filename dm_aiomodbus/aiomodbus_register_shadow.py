@@ -0,0 +1,72 @@
+from __future__ import annotations
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+__all__ = ['DMAioModbusRegisterShadow']
+
+
+class DMAioModbusRegisterShadow:
+    """Last known register/coil values: a dense window of array('H') plus a dict for other addresses"""
+    __slots__ = ("__base", "__values", "__known", "__sparse")
+
+    def __init__(self, base: int = 0, size: int = 0) -> None:
+        self.__base = base
+        self.__values = array("H", bytes(2 * size))
+        self.__known = bytearray(size)
+        self.__sparse: Dict[int, int] = {}
+
+    def get(self, address: int) -> Optional[int]:
+        index = address - self.__base
+        if 0 <= index < len(self.__known):
+            return self.__values[index] if self.__known[index] else None
+        return self.__sparse.get(address)
+
+    def update(self, address: int, values: List[int]) -> None:
+        start, end = self.__window(address, len(values))
+        if start < end:
+            shift = self.__base - address
+            try:
+                self.__values[start:end] = array("H", values[start + shift:end + shift])
+                self.__known[start:end] = b"\x01" * (end - start)
+            except (OverflowError, TypeError):
+                self.__known[start:end] = bytes(end - start)
+        for offset, value in enumerate(values):
+            if not start <= address + offset - self.__base < end:
+                self.__sparse[address + offset] = int(value)
+
+    def drop(self, address: int, count: int) -> None:
+        start, end = self.__window(address, count)
+        self.__known[start:end] = bytes(end - start)
+        for run_address in range(address, address + count):
+            self.__sparse.pop(run_address, None)
+
+    def changed_runs(self, address: int, values: List[int]) -> List[Tuple[int, List[int]]]:
+        start, end = self.__window(address, len(values))
+        if end - start == len(values) and self.__known.find(0, start, end) == -1:
+            try:
+                if self.__values[start:end] == array("H", values):
+                    return []
+            except (OverflowError, TypeError):
+                pass
+
+        runs = []
+        for offset, value in enumerate(values):
+            if self.__holds(address + offset, value):
+                continue
+            if runs and runs[-1][0] + len(runs[-1][1]) == address + offset:
+                runs[-1][1].append(value)
+            else:
+                runs.append((address + offset, [value]))
+        return runs
+
+    def __holds(self, address: int, value: int) -> bool:
+        # compare only known values: get() returns None for unknown addresses, which would match a None value
+        index = address - self.__base
+        if 0 <= index < len(self.__known):
+            return bool(self.__known[index]) and self.__values[index] == value
+        return address in self.__sparse and self.__sparse[address] == value
+
+    def __window(self, address: int, count: int) -> Tuple[int, int]:
+        start = max(address - self.__base, 0)
+        end = min(address + count - self.__base, len(self.__known))
+        return start, max(start, end)
@@ -5,6 +5,8 @@ from .aiomodbus_base_client import DMAioModbusBaseClient
 
 
 class DMAioModbusSimulatorClient(DMAioModbusBaseClient):
+    __slots__ = ("__connected",)
+
     def __init__(
         self,
         return_errors: bool = False,